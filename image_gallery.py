@@ -7,13 +7,39 @@ Image Thumbnail Gallery Generator (patched)
 from __future__ import annotations
 
 import argparse
+import io
 import logging
+import math
+import os
 import re
-from dataclasses import dataclass
+import shutil
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator, Sequence
+
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+try:  # optional, see the "turbo" extra in pyproject.toml
+    import numpy as np
+    from turbojpeg import (
+        TJPF_GRAY,
+        TJPF_RGB,
+        TJSAMP_420,
+        TJSAMP_422,
+        TJSAMP_444,
+        TJSAMP_GRAY,
+        TurboJPEG,
+    )
 
-from PIL import Image, ImageOps
+    # Pillow subsampling names -> TurboJPEG constants (see JPEG_SUBSAMPLING)
+    TJ_SUBSAMPLING = {"4:4:4": TJSAMP_444, "4:2:2": TJSAMP_422, "4:2:0": TJSAMP_420}
+except ImportError:
+    TurboJPEG = None
 
 
 # ----------------------------
@@ -26,6 +52,22 @@ DEFAULT_EXTENSIONS = (".jpg", ".jpeg")
 
 DPI_THRESHOLD = 250  # consistent across orientations
 
+EXIF_ORIENTATION_TAG = 0x0112
+TRANSPOSED_ORIENTATIONS = frozenset({5, 6, 7, 8})  # rotated 90/270 degrees: W/H swap on display
+
+LOG_FORMAT = "%(levelname)s: %(message)s"
+
+IMAGES_PER_TASK = 8  # images handed to a worker process at a time
+
+# Thumbnail encoding, identical for every file (and for both encoders)
+JPEG_QUALITY = 85
+JPEG_SUBSAMPLING = "4:2:0"  # "4:4:4", "4:2:2" or "4:2:0"
+
+# sanitize_for_filename patterns, compiled once
+_WS_RE = re.compile(r"\s+")
+_BAD_RE = re.compile(r"[^A-Za-z0-9._-]+")
+_DASH_RE = re.compile(r"-{2,}")
+
 # ----------------------------
 # Data structures
 # ----------------------------
@@ -37,24 +79,32 @@ class ImageInfo:
     dpi: int  # integer DPI (x axis)
 
 
+class Bucket(IntEnum):
+    """
+    Statistics bucket; the value is the index into Stats.counts.
+    """
+    LANDSCAPE_HIGH_DPI = 0
+    LANDSCAPE_LOW_DPI = 1
+    LANDSCAPE_OTHER_DPI = 2
+    PORTRAIT_HIGH_DPI = 3
+    PORTRAIT_LOW_DPI = 4
+    PORTRAIT_OTHER_DPI = 5
+
+
 @dataclass
 class Stats:
-    landscape_high_dpi: int = 0
-    landscape_low_dpi: int = 0
-    landscape_other_dpi: int = 0
-    portrait_high_dpi: int = 0
-    portrait_low_dpi: int = 0
-    portrait_other_dpi: int = 0
+    counts: list[int] = field(default_factory=lambda: [0] * len(Bucket))
+
+    @classmethod
+    def from_infos(cls, infos: Iterable[ImageInfo]) -> Stats:
+        """
+        Classify a whole batch at once; Counter does the tallying in C.
+        """
+        tally = Counter(map(classify_image, infos))
+        return cls(counts=[tally[bucket] for bucket in Bucket])
 
     def as_dict(self) -> dict[str, int]:
-        return {
-            "landscape_high_dpi": self.landscape_high_dpi,
-            "landscape_low_dpi": self.landscape_low_dpi,
-            "landscape_other_dpi": self.landscape_other_dpi,
-            "portrait_high_dpi": self.portrait_high_dpi,
-            "portrait_low_dpi": self.portrait_low_dpi,
-            "portrait_other_dpi": self.portrait_other_dpi,
-        }
+        return {bucket.name.lower(): self.counts[bucket] for bucket in Bucket}
 
 
 HEADERS = {
@@ -79,12 +129,20 @@ def sanitize_for_filename(text: str, max_len: int = 120) -> str:
     - collapse repeats
     """
     text = text.strip()
-    text = re.sub(r"\s+", "_", text)
-    text = re.sub(r"[^A-Za-z0-9._-]+", "-", text)
-    text = re.sub(r"-{2,}", "-", text)
+    text = _WS_RE.sub("_", text)
+    text = _BAD_RE.sub("-", text)
+    text = _DASH_RE.sub("-", text)
     return text[:max_len].strip("-_.")
 
 
+@lru_cache(maxsize=4096)
+def sanitized_subfolder(name: str) -> str:
+    """
+    sanitize_for_filename for folder names, cached: all images in a folder share it.
+    """
+    return sanitize_for_filename(name)
+
+
 def parse_extensions(raw: str) -> tuple[str, ...]:
     """
     "--extensions .jpg,.jpeg,.png" -> (".jpg",".jpeg",".png")
@@ -98,25 +156,58 @@ def parse_extensions(raw: str) -> tuple[str, ...]:
     return tuple(exts) if exts else tuple(DEFAULT_EXTENSIONS)
 
 
-def iter_images(base_folder: Path, output_folder: Path, extensions: Sequence[str]) -> Iterable[Path]:
+def iter_images(base_folder: Path, output_folder: Path, extensions: Sequence[str]) -> Iterable[str]:
     """
-    Yield image paths under base_folder recursively, excluding output_folder subtree.
+    Yield image paths (as str) under base_folder recursively, excluding output_folder subtree.
+    Same order as os.walk (top-down, symlinked folders not followed).
     """
-    output_folder = output_folder.resolve()
-    extensions_set = {e.lower() for e in extensions}
-
-    # classic walk is fast and lets us prune
-    for root, dirs, files in __import__("os").walk(base_folder):
-        root_path = Path(root)
-
-        # prune output folder
-        if output_folder.name in dirs and (root_path / output_folder.name).resolve() == output_folder:
-            dirs.remove(output_folder.name)
+    # Identify the output folder by (device, inode): one stat here instead of a realpath per
+    # candidate folder. If it does not exist yet there is nothing to prune.
+    try:
+        output_stat = os.stat(output_folder)
+    except OSError:
+        output_stat = None
+    extensions = tuple(e.lower() for e in extensions)
+
+    # scandir hands us names and entry types without building a Path per file
+    pending = [os.fspath(base_folder)]
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError:
+            continue
 
-        for name in files:
-            p = root_path / name
-            if p.suffix.lower() in extensions_set:
-                yield p
+        subfolders = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if not is_dir:
+                if entry.name.lower().endswith(extensions):
+                    yield entry.path
+                continue
+
+            if entry.is_symlink():
+                continue
+
+            # prune output folder (inode() comes with the directory listing on POSIX; the
+            # cached DirEntry stat has st_dev == 0 on Windows, so confirm with a real stat)
+            if output_stat is not None:
+                try:
+                    if entry.inode() == output_stat.st_ino and os.path.samestat(
+                        os.stat(entry.path, follow_symlinks=False), output_stat
+                    ):
+                        continue
+                except OSError:
+                    pass
+            subfolders.append(entry.path)
+
+        # depth-first in listing order
+        pending.extend(reversed(subfolders))
 
 
 def dpi_from_img_info(img: Image.Image) -> int:
@@ -130,9 +221,30 @@ def dpi_from_img_info(img: Image.Image) -> int:
         return 72
 
 
-def classify_image(info: ImageInfo) -> str:
+def exif_orientation(img: Image.Image) -> int:
+    """
+    Read the EXIF Orientation tag; default to 1 (normal) if missing/invalid.
+    """
+    try:
+        return int(img.getexif().get(EXIF_ORIENTATION_TAG, 1))
+    except Exception:
+        return 1
+
+
+def image_info_from_header(img: Image.Image, orientation: int) -> ImageInfo:
+    """
+    ImageInfo as the image displays (EXIF orientation applied), without decoding pixels.
+    Image.open only parses the file header, so size, dpi and EXIF are already available.
     """
-    Returns a Stats field name.
+    width, height = img.size
+    if orientation in TRANSPOSED_ORIENTATIONS:
+        width, height = height, width
+    return ImageInfo(width=width, height=height, dpi=dpi_from_img_info(img))
+
+
+def classify_image(info: ImageInfo) -> Bucket:
+    """
+    Returns the Stats bucket.
     Uses consistent thresholds:
         high: > DPI_THRESHOLD
         low:  < DPI_THRESHOLD
@@ -142,17 +254,17 @@ def classify_image(info: ImageInfo) -> str:
 
     if is_landscape:
         if info.dpi > DPI_THRESHOLD:
-            return "landscape_high_dpi"
+            return Bucket.LANDSCAPE_HIGH_DPI
         if info.dpi < DPI_THRESHOLD:
-            return "landscape_low_dpi"
-        return "landscape_other_dpi"
+            return Bucket.LANDSCAPE_LOW_DPI
+        return Bucket.LANDSCAPE_OTHER_DPI
 
     # portrait / square
     if info.dpi > DPI_THRESHOLD:
-        return "portrait_high_dpi"
+        return Bucket.PORTRAIT_HIGH_DPI
     if info.dpi < DPI_THRESHOLD:
-        return "portrait_low_dpi"
-    return "portrait_other_dpi"
+        return Bucket.PORTRAIT_LOW_DPI
+    return Bucket.PORTRAIT_OTHER_DPI
 
 
 def build_output_filename(serial: int, source_subfolder: str, original_name: str, info: ImageInfo) -> str:
@@ -160,11 +272,53 @@ def build_output_filename(serial: int, source_subfolder: str, original_name: str
     Serial + subfolder + original stem + WxH@DPI
     Output is always JPG.
     """
-    sub = sanitize_for_filename(source_subfolder)
+    sub = sanitized_subfolder(source_subfolder)
     orig = sanitize_for_filename(Path(original_name).stem)
     return f"{serial:03d}-{sub}-{orig}-{info.width}x{info.height}@{info.dpi}.jpg"
 
 
+@lru_cache(maxsize=1)
+def _turbojpeg() -> TurboJPEG | None:
+    """
+    One TurboJPEG instance per process, or None if PyTurboJPEG/libturbojpeg is not available.
+    """
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError) as e:
+        logging.debug("TurboJPEG unavailable, encoding with Pillow (%s)", e)
+        return None
+
+
+def encode_jpeg(img: Image.Image) -> bytes:
+    """
+    Encode an RGB/L image as baseline JPEG (JPEG_QUALITY, JPEG_SUBSAMPLING).
+    Uses the TurboJPEG API when available (a single C call), otherwise Pillow.
+    """
+    turbo = _turbojpeg()
+    if turbo is not None:
+        if img.mode == "L":
+            return turbo.encode(
+                np.asarray(img),
+                quality=JPEG_QUALITY,
+                pixel_format=TJPF_GRAY,
+                jpeg_subsample=TJSAMP_GRAY,
+            )
+        return turbo.encode(
+            np.asarray(img),
+            quality=JPEG_QUALITY,
+            pixel_format=TJPF_RGB,
+            jpeg_subsample=TJ_SUBSAMPLING[JPEG_SUBSAMPLING],
+        )
+
+    # Subsampling only applies to colour; grayscale stays a single 1x1-sampled component
+    params = {"subsampling": JPEG_SUBSAMPLING} if img.mode == "RGB" else {}
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=JPEG_QUALITY, **params)
+    return buf.getvalue()
+
+
 def thumb_size_for_width(img: Image.Image, thumb_width: int) -> tuple[int, int]:
     """
     Compute (thumb_width, proportional_height) from current image size.
@@ -180,76 +334,192 @@ def thumb_size_for_width(img: Image.Image, thumb_width: int) -> tuple[int, int]:
 # Core operations (single-pass)
 # ----------------------------
 
-def collect_stats(base_folder: Path, output_folder: Path, extensions: Sequence[str]) -> Stats:
-    stats = Stats()
-
-    for image_path in iter_images(base_folder, output_folder, extensions):
-        try:
-            with Image.open(image_path) as img:
-                img = ImageOps.exif_transpose(img)
-                info = ImageInfo(width=img.size[0], height=img.size[1], dpi=dpi_from_img_info(img))
-        except Exception as e:
-            logging.warning("Skipping unreadable image for stats: %s (%s)", image_path, e)
-            continue
-
-        field = classify_image(info)
-        setattr(stats, field, getattr(stats, field) + 1)
-
-    return stats
+def _init_worker(log_level: int) -> None:
+    """
+    Worker processes started with "spawn" (Windows/macOS) do not inherit logging config.
+    """
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
 
 
-def generate_thumbnails(
-    base_folder: Path,
+def _process_one(
+    image_path: str,
+    serial: int,
     output_folder: Path,
     thumb_width: int,
-    extensions: Sequence[str],
     skip_existing: bool,
-    max_images: int | None,
-) -> int:
-    output_folder.mkdir(parents=True, exist_ok=True)
-
-    serial = 1
-    created = 0
-
-    for image_path in iter_images(base_folder, output_folder, extensions):
-        if max_images is not None and created >= max_images:
-            break
-
-        try:
-            with Image.open(image_path) as img:
-                # Apply EXIF orientation first so W/H reflect how it should display
+    stats_only: bool,
+    data: Future[bytes] | None = None,
+) -> tuple[ImageInfo | None, bool]:
+    """
+    Read one image and create its thumbnail (runs in a worker process).
+    Returns (info, created); info is None if the image could not be read at all.
+    With stats_only the image header is read but no thumbnail is made.
+    data: the file contents being read ahead (see _read_ahead); None -> open from disk.
+    """
+    info = None
+    try:
+        source = io.BytesIO(data.result()) if data is not None else image_path
+        with Image.open(source) as img:
+            orientation = exif_orientation(img)
+            info = image_info_from_header(img, orientation)
+
+            if stats_only:
+                return info, False
+
+            source_subfolder = os.path.basename(os.path.dirname(image_path))
+            out_name = build_output_filename(
+                serial, source_subfolder, os.path.basename(image_path), info
+            )
+            out_path = output_folder / out_name
+
+            if skip_existing and out_path.exists():
+                logging.info("Skipping existing: %s", out_path.name)
+                return info, False
+
+            # Already thumbnail-sized JPEG that needs no rotation: copy it, skipping decode/encode
+            if (
+                info.width <= thumb_width
+                and img.format == "JPEG"
+                and img.mode in ("RGB", "L")
+                and orientation == 1
+            ):
+                if data is not None:
+                    out_path.write_bytes(data.result())
+                else:
+                    shutil.copyfile(image_path, out_path)
+                logging.info("Thumbnail copied: %s -> %s", os.path.basename(image_path), out_name)
+                return info, True
+
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale straight from the DCT coefficients,
+            # keeping at least twice the thumbnail width for the Lanczos pass (no-op for non-JPEG)
+            scale = 2 * thumb_width / info.width
+            img.draft("RGB", (math.ceil(img.size[0] * scale), math.ceil(img.size[1] * scale)))
+
+            # Apply EXIF orientation so the thumbnail displays upright (copies the image, so
+            # only when there is something to rotate)
+            if orientation != 1:
                 img = ImageOps.exif_transpose(img)
 
-                info = ImageInfo(width=img.size[0], height=img.size[1], dpi=dpi_from_img_info(img))
+            # reducing_gap=1.0: box-average (area) reduce by the integer part of the remaining
+            # factor, then a short Lanczos pass for the fractional rest
+            tw, th = thumb_size_for_width(img, thumb_width)
+            img.thumbnail((tw, th), resample=Image.Resampling.LANCZOS, reducing_gap=1.0)
+
+            # Ensure JPEG-compatible mode
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+
+            # Encode in memory and write the file with a single call. Baseline JPEG with the
+            # standard Huffman tables: optimize/progressive cost extra passes for a few % size.
+            out_path.write_bytes(encode_jpeg(img))
+
+    except Exception as e:
+        if info is None:
+            # Pillow's message reprs the file object, i.e. the read-ahead buffer; the path is
+            # already in the warning
+            reason = "cannot identify image file" if isinstance(e, UnidentifiedImageError) else e
+            logging.warning("Skipping unreadable image: %s (%s)", image_path, reason)
+        else:
+            logging.warning("Failed processing image: %s (%s)", image_path, e)
+        return info, False
 
-                source_subfolder = image_path.parent.name
-                out_name = build_output_filename(serial, source_subfolder, image_path.name, info)
-                out_path = output_folder / out_name
+    logging.info("Thumbnail created: %s -> %s", os.path.basename(image_path), out_name)
+    return info, True
 
-                if skip_existing and out_path.exists():
-                    logging.info("Skipping existing: %s", out_path.name)
-                    serial += 1
-                    continue
 
-                tw, th = thumb_size_for_width(img, thumb_width)
-                img.thumbnail((tw, th), resample=Image.Resampling.LANCZOS)
+def _read_ahead(image_paths: Sequence[str]) -> Iterator[Future[bytes]]:
+    """
+    Yield a future with the contents of each file, in order. The next file is read on a
+    background thread while the caller works on the current one.
+    """
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        upcoming = None
+        for path in image_paths:
+            current, upcoming = upcoming, reader.submit(Path(path).read_bytes)
+            if current is not None:
+                yield current
+        if upcoming is not None:
+            yield upcoming
+
+
+def _process_chunk(
+    jobs: Sequence[tuple[int, str]],
+    output_folder: Path,
+    thumb_width: int,
+    skip_existing: bool,
+    stats_only: bool,
+) -> list[tuple[ImageInfo | None, bool]]:
+    """
+    Process a run of (serial, path) jobs in one worker task.
+    When every image gets decoded, disk reads overlap with decoding/encoding via _read_ahead.
+    Stats-only and skip-existing runs mostly need just the header, so they read on demand.
+    """
+    paths = [path for _, path in jobs]
+    sources = repeat(None) if stats_only or skip_existing else _read_ahead(paths)
 
-                # Ensure JPEG-compatible mode
-                if img.mode not in ("RGB", "L"):
-                    img = img.convert("RGB")
+    return [
+        _process_one(path, serial, output_folder, thumb_width, skip_existing, stats_only, data)
+        for (serial, path), data in zip(jobs, sources, strict=False)
+    ]
 
-                img.save(out_path, format="JPEG", quality=85, optimize=True, progressive=True)
 
-        except Exception as e:
-            logging.warning("Failed processing image: %s (%s)", image_path, e)
-            serial += 1
-            continue
+def process_all(
+    base_folder: Path,
+    output_folder: Path,
+    thumb_width: int,
+    extensions: Sequence[str],
+    skip_existing: bool,
+    max_images: int | None,
+    workers: int | None = None,
+) -> tuple[Stats, int]:
+    """
+    One pass over all images: every file is opened once, counted in the statistics and
+    thumbnailed in the same go. Returns (stats, thumbnails created).
 
-        logging.info("Thumbnail created: %s -> %s", image_path.name, out_path.name)
-        serial += 1
-        created += 1
+    Images are processed in parallel, IMAGES_PER_TASK per task (workers=None -> one process
+    per CPU). Serials follow the scan order, exactly as in a sequential run.
+    """
+    output_folder.mkdir(parents=True, exist_ok=True)
+
+    jobs = list(enumerate(iter_images(base_folder, output_folder, extensions), start=1))
 
-    return created
+    infos: list[ImageInfo] = []
+    created = 0
+    start = 0
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(logging.getLogger().getEffectiveLevel(),),
+    ) as pool:
+        while start < len(jobs):
+            if max_images is not None and created >= max_images:
+                # Limit reached: the remaining images only count towards the statistics
+                stats_only = True
+                end = len(jobs)
+            else:
+                # With --max-images only dispatch as many images as are still missing, so
+                # skipped or failed images are topped up from the following ones.
+                stats_only = False
+                end = len(jobs) if max_images is None else start + max_images - created
+
+            batch = jobs[start:end]
+            chunks = [batch[i:i + IMAGES_PER_TASK] for i in range(0, len(batch), IMAGES_PER_TASK)]
+            for results in pool.map(
+                _process_chunk,
+                chunks,
+                repeat(output_folder),
+                repeat(thumb_width),
+                repeat(skip_existing),
+                repeat(stats_only),
+            ):
+                for info, ok in results:
+                    if info is not None:
+                        infos.append(info)
+                    created += ok
+            start = end
+
+    return Stats.from_infos(infos), created
 
 
 def generate_html_gallery(output_folder: Path, vote_box: bool) -> Path:
@@ -319,24 +589,17 @@ def generate_html_gallery(output_folder: Path, vote_box: bool) -> Path:
     }
     """
 
-    cards_html = []
-    for idx, name in enumerate(images, start=1):
-        serial = name.split("-", 1)[0] if "-" in name else str(idx)
-        # add page-break after every 4th card
-        extra_class = " page-break" if (idx % 4 == 0) else ""
-
-        vote_html = "<div class='vote'>VOTE HERE</div>" if vote_box else ""
-        cards_html.append(
-            f"""
-            <div class="card{extra_class}">
-                <img src="./{name}" alt="{name}" title="{name}">
-                <div class="meta">Image nr # {serial}</div>
-                {vote_html}
+    # One card per image: (extra class, name, name, name, serial, vote box)
+    card_fmt = """
+            <div class="card%s">
+                <img src="./%s" alt="%s" title="%s">
+                <div class="meta">Image nr # %s</div>
+                %s
             </div>
             """
-        )
+    vote_html = "<div class='vote'>VOTE HERE</div>" if vote_box else ""
 
-    html = f"""<!DOCTYPE html>
+    header = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -349,14 +612,29 @@ def generate_html_gallery(output_folder: Path, vote_box: bool) -> Path:
 <body>
 <h1>Photo Vote Sheet</h1>
 <div class="gallery">
-    {''.join(cards_html)}
+    """
+    footer = """
     </div>
 </body>
 </html>
 """
 
+    # Stream the cards straight to the file instead of building the whole page in memory
     out_file = output_folder / "ImageGallery.html"
-    out_file.write_text(html, encoding="utf-8")
+    with out_file.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(header)
+        for idx, name in enumerate(images, start=1):
+            f.write(
+                card_fmt % (
+                    " page-break" if idx % 4 == 0 else "",  # page-break after every 4th card
+                    name,
+                    name,
+                    name,
+                    name.split("-", 1)[0] if "-" in name else idx,
+                    vote_html,
+                )
+            )
+        f.write(footer)
     logging.info("HTML gallery written: %s", out_file)
     return out_file
 
@@ -366,6 +644,19 @@ def generate_html_gallery(output_folder: Path, vote_box: bool) -> Path:
 # CLI / main
 # ----------------------------
 
+def positive_int(raw: str) -> int:
+    """
+    argparse type: integer >= 1.
+    """
+    try:
+        value = int(raw)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {raw!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate thumbnails and an optional HTML gallery.")
     parser.add_argument(
@@ -403,6 +694,12 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Process at most N images (useful for quick tests).",
     )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes for thumbnail generation (default: number of CPUs).",
+    )
     parser.add_argument(
         "--html",
         action="store_true",
@@ -427,7 +724,7 @@ def main() -> int:
 
     logging.basicConfig(
         level=getattr(logging, args.log_level),
-        format="%(levelname)s: %(message)s",
+        format=LOG_FORMAT,
     )
 
     base_folder: Path = args.input.resolve()
@@ -441,20 +738,27 @@ def main() -> int:
     logging.info("Skip existing:  %s", args.skip_existing)
     if args.max_images is not None:
         logging.info("Max images:     %s", args.max_images)
+    if args.workers is not None:
+        logging.info("Workers:        %s", args.workers)
 
-    stats = collect_stats(base_folder, output_folder, extensions)
-    logging.info("Image statistics:")
-    for key, value in stats.as_dict().items():
-        print(f"{HEADERS.get(key, key)}: {value}")
+    if features.check_feature("libjpeg_turbo"):
+        logging.debug("JPEG library:   libjpeg-turbo %s", features.version("libjpeg_turbo"))
+    else:
+        logging.debug("JPEG library:   libjpeg %s (not turbo)", features.version("jpg"))
 
-    created = generate_thumbnails(
+    stats, created = process_all(
         base_folder=base_folder,
         output_folder=output_folder,
         thumb_width=args.thumb_width,
         extensions=extensions,
         skip_existing=args.skip_existing,
         max_images=args.max_images,
+        workers=args.workers,
     )
+    logging.info("Image statistics:")
+    for key, value in stats.as_dict().items():
+        print(f"{HEADERS.get(key, key)}: {value}")
+
     logging.info("Thumbnails created: %d", created)
 
     if args.html: